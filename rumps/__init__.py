@@ -11,5 +11,5 @@ __author__ = 'Jared Suttles'
 __license__ = 'Modified BSD'
 __copyright__ = 'Copyright 2013 Jared Suttles'
 
-from .rumps import (debug_mode, alert, notification, application_support, timer, clicked, notifications, MenuItem,
-                    Window, App)
+from .rumps import (debug_mode, watchdog, record_events, trace_memory, alert, notification, application_support, timer,
+                    clicked, notifications, MenuItem, Window, App)
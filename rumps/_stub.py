@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# rumps: Ridiculously Uncomplicated Mac os x Python statusbar appS.
+# Copyright: (c) 2013, Jared Suttles. All rights reserved.
+# License: BSD, see LICENSE for details.
+# - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+"""
+Stand-ins for the handful of Foundation, AppKit and PyObjCTools names rumps uses. Used instead of PyObjC when the
+RUMPS_BACKEND environment variable is set to 'stub', so that recorded events can be fed through an app with App.replay
+on any platform. Nothing is ever drawn: menus, alerts and notifications only keep the values set on them.
+"""
+import os
+import sys
+import time
+
+NSDefaultRunLoopMode = 'kCFRunLoopDefaultMode'
+NSRunLoopCommonModes = 'kCFRunLoopCommonModes'
+
+
+class NSObject(object):
+    """
+    Base for every stub. `setFoo_(value)` stores the value and `foo()` returns it again, which covers most of what
+    rumps does with Cocoa objects.
+    """
+    @classmethod
+    def alloc(cls):
+        return cls.__new__(cls)
+
+    def init(self):
+        return self
+
+    def __getattr__(self, name):
+        if name.startswith('set') and name.endswith('_') and len(name) > 4:
+            key = '_' + name[3].lower() + name[4:-1]
+            return lambda value: self.__dict__.__setitem__(key, value)
+        if '_' + name in self.__dict__:
+            return lambda: self.__dict__['_' + name]
+        raise AttributeError(name)
+
+
+def NSLog(message):
+    sys.stderr.write('{} {}\n'.format(time.strftime('%Y-%m-%d %H:%M:%S'), message))
+
+
+def NSMakeRect(x, y, width, height):
+    return (x, y), (width, height)
+
+
+class _NSArray(list):
+    def objectAtIndex_(self, index):
+        return self[index]
+
+
+def NSSearchPathForDirectoriesInDomains(directory, domain, expand):
+    return _NSArray([os.path.expanduser(os.path.join('~', 'Library', 'Application Support'))])
+
+
+class _NSSize(object):
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+
+class NSDate(NSObject):
+    @classmethod
+    def date(cls):
+        return cls.dateWithTimeInterval_sinceDate_(0, None)
+
+    @classmethod
+    def dateWithTimeInterval_sinceDate_(cls, interval, date):
+        self = cls.alloc().init()
+        self._timeIntervalSince1970 = (time.time() if date is None else date.timeIntervalSince1970()) + interval
+        return self
+
+
+class NSTimer(NSObject):
+    def initWithFireDate_interval_target_selector_userInfo_repeats_(self, date, interval, target, selector, info,
+                                                                    repeats):
+        self._timeInterval = interval
+        self._target = target
+        self._selector = selector
+        self._valid = True
+        return self
+
+    @classmethod
+    def timerWithTimeInterval_target_selector_userInfo_repeats_(cls, interval, target, selector, info, repeats):
+        return cls.alloc().initWithFireDate_interval_target_selector_userInfo_repeats_(
+            NSDate.date(), interval, target, selector, info, repeats)
+
+    def fire(self):
+        if self._valid:
+            getattr(self._target, self._selector.replace(':', '_'))(self)
+
+    def invalidate(self):
+        self._valid = False
+
+
+class NSRunLoop(NSObject):
+    @classmethod
+    def currentRunLoop(cls):
+        return _run_loop
+
+    def addTimer_forMode_(self, timer, mode):
+        pass  # there is no run loop to fire timers; App.replay fires recorded ticks itself
+_run_loop = NSRunLoop.alloc().init()
+
+
+class NSUserNotification(NSObject):
+    pass
+
+
+class NSUserNotificationCenter(NSObject):
+    @classmethod
+    def defaultUserNotificationCenter(cls):
+        return _notification_center
+
+    def scheduleNotification_(self, notification):
+        pass
+
+    def removeDeliveredNotification_(self, notification):
+        pass
+_notification_center = NSUserNotificationCenter.alloc().init()
+
+
+class NSImage(NSObject):
+    def initByReferencingFile_(self, filename):
+        self._filename = filename
+        self._size = _NSSize(0, 0)
+        return self
+
+    def setSize_(self, size):
+        self._size = _NSSize(*size)
+
+    def representations(self):
+        return []  # nothing is ever decoded
+
+
+class NSMenuItem(NSObject):
+    @classmethod
+    def separatorItem(cls):
+        return cls.alloc().initWithTitle_action_keyEquivalent_('', None, '')
+
+    def initWithTitle_action_keyEquivalent_(self, title, action, key):
+        self._title = title
+        self._action = action
+        self._keyEquivalent = key
+        self._state = 0
+        self._hidden = False
+        self._submenu = self._image = self._target = None
+        return self
+
+
+class NSMenu(NSObject):
+    def init(self):
+        self._itemArray = []
+        return self
+
+    def addItem_(self, item):
+        self._itemArray.append(item)
+
+
+class NSStatusItem(NSObject):
+    pass
+
+
+class NSStatusBar(NSObject):
+    @classmethod
+    def systemStatusBar(cls):
+        return cls.alloc().init()
+
+    def statusItemWithLength_(self, length):
+        return NSStatusItem.alloc().init()
+
+
+class NSAlert(NSObject):
+    @classmethod
+    def alertWithMessageText_defaultButton_alternateButton_otherButton_informativeTextWithFormat_(
+            cls, title, ok, cancel, other, message):
+        self = cls.alloc().init()
+        self._messageText = title
+        self._informativeText = message
+        return self
+
+    def addButtonWithTitle_(self, title):
+        pass
+
+    def runModal(self):
+        return 1  # as if the default button was clicked
+
+
+class NSTextField(NSObject):
+    def initWithFrame_(self, frame):
+        self._stringValue = ''
+        return self
+
+    def validateEditing(self):
+        pass
+
+
+class NSApplication(NSObject):
+    @classmethod
+    def sharedApplication(cls):
+        return _application
+
+    def activateIgnoringOtherApps_(self, flag):
+        pass
+_application = NSApplication.alloc().init()
+
+
+class AppHelper(object):
+    pending = []
+
+    @staticmethod
+    def callAfter(func, *args, **kwargs):
+        AppHelper.pending.append((func, args, kwargs))  # no main thread to hand over to, so replay isn't raced
+
+    @staticmethod
+    def runEventLoop():
+        raise RuntimeError('no event loop with the stub backend; use App.replay to feed recorded events to an app')
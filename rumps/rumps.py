@@ -5,14 +5,35 @@
 # Copyright: (c) 2013, Jared Suttles. All rights reserved.
 # License: BSD, see LICENSE for details.
 # - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-from Foundation import (NSUserNotification, NSUserNotificationCenter, NSDate, NSTimer, NSRunLoop, NSDefaultRunLoopMode,
-                        NSSearchPathForDirectoriesInDomains, NSMakeRect, NSLog, NSObject)
-from AppKit import NSApplication, NSStatusBar, NSMenu, NSMenuItem, NSAlert, NSTextField, NSImage
-from PyObjCTools import AppHelper
-
+import dis
+import json
+import logging
+import logging.handlers
 import os
 import sys
-from collections import OrderedDict, Mapping
+import threading
+import time
+import traceback
+import warnings
+import weakref
+from collections import OrderedDict, Mapping, Sequence, deque
+from itertools import islice
+
+if os.environ.get('RUMPS_BACKEND') == 'stub':  # e.g. replaying recorded events on Linux -> callbacks run, nothing shown
+    from ._stub import (NSUserNotification, NSUserNotificationCenter, NSDate, NSTimer, NSRunLoop, NSDefaultRunLoopMode,
+                        NSRunLoopCommonModes, NSSearchPathForDirectoriesInDomains, NSMakeRect, NSLog, NSObject,
+                        NSApplication, NSStatusBar, NSMenu, NSMenuItem, NSAlert, NSTextField, NSImage, AppHelper)
+else:
+    from Foundation import (NSUserNotification, NSUserNotificationCenter, NSDate, NSTimer, NSRunLoop,
+                            NSDefaultRunLoopMode, NSRunLoopCommonModes, NSSearchPathForDirectoriesInDomains, NSMakeRect,
+                            NSLog, NSObject)
+    from AppKit import NSApplication, NSStatusBar, NSMenu, NSMenuItem, NSAlert, NSTextField, NSImage
+    from PyObjCTools import AppHelper
+
+try:
+    import tracemalloc
+except ImportError:  # standard library from Python 3.4, pytracemalloc before that
+    tracemalloc = None
 
 
 def debug_mode(choice):
@@ -40,6 +61,52 @@ def debug_mode(choice):
 debug_mode(False)
 
 
+def watchdog(threshold=2.0, filename='watchdog.log'):
+    """
+    Watch for the main thread getting stuck, e.g. in a long-running @clicked or @timer callback. Once the run loop has
+    gone more than `threshold` seconds without a heartbeat, the main thread's stack and the callback it was running are
+    written to `filename`, a rotating log in the application support folder. Call before App.run.
+    """
+    if threshold <= 0:
+        raise ValueError('threshold must be a positive number of seconds; given {}'.format(threshold))
+    watchdog.__dict__['*settings'] = threshold, filename
+
+
+def record_events(filename='events.log'):
+    """
+    Record menu clicks, timer ticks and notification activations to `filename` in the application support folder, for
+    feeding back into an app with App.replay later. The file is overwritten each time the app runs. Call before App.run.
+    """
+    record_events.__dict__['*filename'] = filename
+
+
+def trace_memory(choice):
+    """
+    Enable/disable attributing memory growth to the callbacks (and the menu paths they are clicked from) that allocated
+    it, which App.memory_report then includes under 'growth'. Requires tracemalloc, which is part of the standard
+    library since Python 3.4 and available as pytracemalloc for older versions. Tracing slows down the whole program and
+    every callback takes two snapshots of the heap, so it is best left off unless hunting for a leak.
+
+    Allocations are matched to a callback through its frame in their tracebacks, so memory taken by other threads in
+    the meantime is not counted. If tracemalloc was already started with too few frames to reach the callback from
+    deeper calls, those allocations are missed.
+    """
+    global _memory_growth
+    if choice:
+        if tracemalloc is None:
+            raise ImportError('tracing memory requires the tracemalloc module')
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            trace_memory.__dict__['*started'] = True
+        if _memory_growth is None:
+            _memory_growth = {}
+    else:
+        _memory_growth = None
+        if trace_memory.__dict__.pop('*started', False):
+            tracemalloc.stop()
+_memory_growth = None
+
+
 def alert(title, message='', ok=None, cancel=False):
     """
     Simple alert window.
@@ -169,6 +236,11 @@ def _call_as_function_or_method(f, event):
     Decorating methods of a class subclassing something other than App should produce AttributeError eventually which
     is hopefully understandable.
     """
+    global _running_callback
+    _running_callback = f, event  # for the watchdog to report on if this call stalls the main thread
+    growth = _memory_growth
+    if growth is not None:
+        before = tracemalloc.take_snapshot()
     try:
         r = f(event)
         _log('given function {} is outside an App subclass definition'.format(repr(f)))
@@ -177,6 +249,82 @@ def _call_as_function_or_method(f, event):
         r = f(getattr(App, '*app_instance'), event)
         _log('given function {} is probably inside a class (which should be an App subclass)'.format(repr(f)))
         return r
+    finally:
+        _running_callback = None
+        if growth is not None and tracemalloc.is_tracing():  # unless the callback itself turned tracing off
+            label = _callback_label(f, event)
+            growth[label] = growth.get(label, 0) + _allocated_by(f, before, tracemalloc.take_snapshot())
+_running_callback = None
+
+
+def _allocated_by(f, before, after):
+    """
+    Net bytes allocated between two tracemalloc snapshots by code running inside f, i.e. with a frame from f's code in
+    its traceback.
+    """
+    code = getattr(getattr(f, '__func__', f), '__code__', None)
+    if code is None:  # not a Python function so there is no frame to look for
+        return 0
+    first = code.co_firstlineno
+    last = max([first] + [lineno for _, lineno in dis.findlinestarts(code)])
+    return sum(stat.size_diff for stat in after.compare_to(before, 'traceback')
+               if any(frame.filename == code.co_filename and first <= frame.lineno <= last for frame in stat.traceback))
+
+
+def _callback_label(f, event):
+    """
+    Name a callback by where it is clicked from -- a menu path, or for entries of bound submenus the owner's path and
+    the slot, since their titles change with every entry shown.
+    """
+    name = getattr(f, '__name__', repr(f))
+    if isinstance(event, MenuItem):
+        app = getattr(App, '*app_instance', None)
+        menu = None if app is None else app.menu
+        path = None if menu is None else _menu_path(menu, event)
+        found = None if menu is None or path is not None else _feed_slot(menu, event)
+        if found is not None:
+            path = found[0] + [str(found[1])]
+        return '{} ({})'.format(' -> '.join(path) if path else repr(event.title), name)
+    return name
+
+
+def _dispatch_notification(data):
+    try:
+        _call_as_function_or_method(getattr(notifications, '*notification_center'), data)
+    except AttributeError:  # notification center function not specified -> no error but warning in log
+        _log('WARNING: notification received but no function specified for answering it; use @notifications '
+             'decorator to register a function.')
+
+
+def _menu_path(menu, menuitem):
+    """
+    Return the list of keys leading from menu to menuitem, or None if it isn't in there.
+    """
+    for key, value in menu.iteritems():
+        if value is menuitem:
+            return [key]
+        if isinstance(value, MenuItem):
+            path = _menu_path(value, menuitem)
+            if path is not None:
+                return [key] + path
+
+
+def _feed_slot(menu, menuitem):
+    """
+    Return the path to the bound MenuItem whose submenu holds menuitem and menuitem's slot there, or None.
+    """
+    for owner in _walk_menu(menu):
+        slot = None if owner._window is None else owner._window.slot(menuitem)
+        if slot is not None:
+            return _menu_path(menu, owner), slot
+
+
+def _walk_menu(menu):
+    for value in menu.itervalues():
+        if isinstance(value, MenuItem):
+            yield value
+            for menuitem in _walk_menu(value):
+                yield menuitem
 #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 
@@ -200,13 +348,15 @@ class MenuItem(OrderedDict):
         self._menuitem = NSMenuItem.alloc().initWithTitle_action_keyEquivalent_(str(title), None, '')
         if callable(callback):
             self.set_callback(callback, key)
-        self._submenu = self._icon = None
+        self._submenu = self._icon = self._window = None
         self.set_icon(icon, dimensions)
         super(MenuItem, self).__init__()
 
     def __setitem__(self, key, value):
         if key in self:
             return
+        if self._window is not None:
+            raise ValueError('cannot add items to a menu item bound to a source')
         if not isinstance(value, MenuItem):
             raise TypeError('values must be instances of MenuItem class; given {}'.format(type(value)))
         if self._submenu is None:
@@ -264,13 +414,201 @@ class MenuItem(OrderedDict):
         self._menuitem.setAction_('callback:')
         self._menuitem.setKeyEquivalent_(key)
 
+    def bind(self, source=None, visible=10, callback=None, history=100):
+        """
+        Use a live feed as the submenu. Entries come from `source`, an iterable (or generator) read in a background
+        thread so that it may block while waiting for new entries, and from the push method. The newest `visible`
+        entries are shown on top, with "More..." paging back through up to `history` older entries and "Back to Top"
+        returning to the newest. A fixed pool of menu items is reused for every page, so a long-running feed costs the
+        same as a short one. The optional callback is set on each of the pooled menu items.
+
+        Binding again replaces the previous feed. The reader thread stops taking entries from the old source once the
+        next one arrives, but it cannot interrupt a source that is blocked waiting.
+        """
+        if self._submenu is not None and self._window is None:
+            raise ValueError('cannot bind a source to a menu item that already has a submenu')
+        if visible < 1:
+            raise ValueError('must show at least one entry; given {}'.format(visible))
+        if history < visible:
+            raise ValueError('history of {} entries cannot fill {} visible entries'.format(history, visible))
+        self.unbind()
+        self._window = _SourceWindow(visible, callback, history)
+        self._submenu = self._window.nsmenu
+        self._menuitem.setSubmenu_(self._submenu)
+        if source is not None:
+            self._window.follow(source)
+
+    def unbind(self):
+        """
+        Stop following the feed bound with the bind method, if any, and remove the submenu.
+        """
+        if self._window is None:
+            return
+        self._window.close()
+        self._window = self._submenu = None
+        self._menuitem.setSubmenu_(None)
+
+    def push(self, entry):
+        """
+        Show a newly arrived entry at the top of a bound submenu. Must be called from the main thread; entries produced
+        in other threads belong in the source given to the bind method.
+        """
+        if self._window is None:
+            raise ValueError('no source bound; use bind method first')
+        self._window.push(entry)
+
     @classmethod
     def callback_(cls, nsmenuitem):
         self, callback = cls._ns_to_py_and_callback[nsmenuitem]
         _log(self)
+        if _recorder is not None:
+            _recorder.click(self)
         return _call_as_function_or_method(callback, self)
 
 
+def _weak_callback(method):
+    """
+    Wrap a bound method for use as a MenuItem callback without the class level callback dictionary keeping the
+    method's instance alive.
+    """
+    ref, func = weakref.ref(method.__self__), method.__func__
+
+    def callback(sender):
+        instance = ref()
+        if instance is not None:
+            return func(instance, sender)
+    callback.__name__ = func.__name__
+    return callback
+
+
+def _read_source(source, window_ref):
+    for entry in source:
+        window = window_ref()
+        if window is None or window.closed:
+            return
+        window.receive(entry)
+        del window  # only the weak reference is held while waiting on the source
+
+
+class _SourceWindow(object):
+    """
+    Fixed-size view onto a feed, backing the submenu of a bound MenuItem. Keeps the newest `history` entries, newest
+    first, and shows `visible` of them starting at the paging offset. Entries read from the source in the reader thread
+    are handed over through a bounded buffer and added on the main thread, so the menu is only ever touched from there.
+    """
+    def __init__(self, visible, callback, history):
+        self._visible = visible
+        self._offset = 0
+        self._entries = deque(maxlen=history)
+        self._incoming = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._flush_pending = False
+        self.closed = False
+
+        self._pool = [MenuItem('', callback) for _ in range(visible)]
+        self._separator = NSMenuItem.separatorItem()
+        self._older = MenuItem('More...', _weak_callback(self.older))
+        self._top = MenuItem('Back to Top', _weak_callback(self.top))
+
+        self.nsmenu = NSMenu.alloc().init()
+        for item in self._pool:
+            self.nsmenu.addItem_(item())
+        self.nsmenu.addItem_(self._separator)
+        self.nsmenu.addItem_(self._older())
+        self.nsmenu.addItem_(self._top())
+        self._render()
+
+    def __repr__(self):
+        return '<{}: [entries: {}; offset: {}; closed: {}]>'.format(type(self).__name__, len(self._entries),
+                                                                   self._offset, self.closed)
+
+    def __del__(self):
+        self.close()
+
+    def follow(self, source):
+        reader = threading.Thread(target=_read_source, args=(iter(source), weakref.ref(self)),
+                                  name='rumps feed reader')
+        reader.daemon = True
+        reader.start()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for item in self._pool + [self._older, self._top]:
+            MenuItem._ns_to_py_and_callback.pop(item(), None)
+
+    def slot(self, menuitem):
+        """
+        Where menuitem sits in this submenu, as an index into the pool or 'more' or 'top', or None if it isn't here.
+        """
+        if menuitem is self._older:
+            return 'more'
+        if menuitem is self._top:
+            return 'top'
+        for i, item in enumerate(self._pool):
+            if item is menuitem:
+                return i
+
+    def item(self, slot):
+        return {'more': self._older, 'top': self._top}[slot] if slot in ('more', 'top') else self._pool[slot]
+
+    def receive(self, entry):
+        """
+        Called from the reader thread.
+        """
+        self._incoming.append(entry)
+        with self._lock:
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+        AppHelper.callAfter(self._flush)
+
+    def _flush(self):
+        with self._lock:
+            self._flush_pending = False
+        if self.closed:
+            return
+        while self._incoming:
+            self._add(self._incoming.popleft())
+        self._render()
+
+    def push(self, entry):
+        self._add(entry)
+        self._render()
+
+    def older(self, _=None):
+        self._offset = min(self._offset + self._visible, self._last_page())
+        _log(self)
+        self._render()
+
+    def top(self, _=None):
+        self._offset = 0
+        _log(self)
+        self._render()
+
+    def _add(self, entry):
+        self._entries.appendleft(entry)
+        if self._offset:  # keep showing the same entries while paged back, as far as a full page allows
+            self._offset = min(self._offset + 1, self._last_page())
+
+    def _last_page(self):
+        return max(0, len(self._entries) - self._visible)
+
+    def _render(self):
+        shown = list(islice(self._entries, self._offset, self._offset + self._visible))
+        for i, item in enumerate(self._pool):
+            if i < len(shown):
+                item.title = shown[i]
+                item().setHidden_(False)
+            else:
+                item().setHidden_(True)
+        has_older = self._offset + self._visible < len(self._entries)
+        self._separator.setHidden_(not has_older and not self._offset)
+        self._older().setHidden_(not has_older)
+        self._top().setHidden_(not self._offset)
+
+
 class Timer(object):
     """
     Python abstraction of an event timer in a new thread for application. Serves as container for ObjC objects,
@@ -302,9 +640,144 @@ class Timer(object):
 
     def callback_(self, _):
         _log(self)
+        if _recorder is not None:
+            _recorder.tick(self)
         return _call_as_function_or_method(getattr(self, '*callback'), self)
 
 
+class _EventRecorder(object):
+    """
+    Writes one compact JSON array per event: seconds since the app started running, the kind of event, and what
+    App.replay needs to find its target again -- a menu path, a menu path with the slot of a bound submenu entry, an
+    index into the @timer timers, or the notification data.
+    """
+    def __init__(self, path, app):
+        self._file = open(path, 'w')
+        self._app = app
+        self._start = time.time()
+
+    def __repr__(self):
+        return '<{}: [file: {}]>'.format(type(self).__name__, repr(self._file.name))
+
+    def click(self, menuitem):
+        menu = self._app.menu
+        path = None if menu is None else _menu_path(menu, menuitem)
+        if path is not None:
+            self._write('click', path)
+            return
+        found = None if menu is None else _feed_slot(menu, menuitem)
+        if found is not None:
+            path, slot = found
+            self._write('feed', [path, slot, None if slot in ('more', 'top') else menuitem.title])
+            return
+        warnings.warn('not recording click on {}; it cannot be reached from the app menu so the recorded events will '
+                      'be incomplete'.format(repr(menuitem.title)), RuntimeWarning)
+
+    def tick(self, t):
+        timers = getattr(timer, '*timers', [])
+        if t in timers:  # only @timer timers can be found again on replay
+            self._write('timer', timers.index(t))
+
+    def notification(self, data):
+        try:
+            data = _json_value(data)
+        except TypeError as e:
+            warnings.warn('not recording notification; {} so the recorded events will be incomplete'.format(e),
+                          RuntimeWarning)
+        else:
+            self._write('notification', data)
+
+    def _write(self, kind, target):
+        event = [round(time.time() - self._start, 3), kind, target]
+        self._file.write(json.dumps(event, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+
+def _json_value(value):
+    """
+    Convert notification data (which may hold Foundation dictionaries and arrays) to plain JSON types, refusing anything
+    that wouldn't come back as the same value on replay.
+    """
+    if value is None or isinstance(value, (bool, int, long, float, basestring)):
+        return value
+    if isinstance(value, Mapping):
+        if not all(isinstance(k, basestring) for k in value):
+            raise TypeError('notification data has keys that are not strings')
+        return dict((k, _json_value(v)) for k, v in value.items())
+    if isinstance(value, Sequence):
+        return [_json_value(v) for v in value]
+    raise TypeError('{} in notification data has no JSON equivalent'.format(type(value).__name__))
+_recorder = None
+
+
+def _utf8(s):
+    """
+    JSON gives back unicode for what were UTF-8 encoded str menu titles and keys, which aren't equal when non-ASCII.
+    """
+    return s.encode('utf-8') if isinstance(s, unicode) else s
+
+
+class _Watchdog(threading.Thread):
+    """
+    Daemon thread receiving heartbeats from an NSTimer on the main run loop. Reports each stall once when it crosses
+    the threshold and again when the main thread recovers. Must be created on the main thread.
+
+    The heartbeat is scheduled in the common run loop modes so that it keeps beating while a menu is open or a modal
+    alert is up, and it is not a rumps Timer so that beating leaves the record of the running callback alone.
+    """
+    def __init__(self, path, threshold):
+        super(_Watchdog, self).__init__(name='rumps watchdog')
+        self.daemon = True
+        self._threshold = threshold
+        self._interval = threshold / 4.0
+        self._main_thread_id = threading.current_thread().ident
+        self._last_beat = time.time()
+
+        self._logger = logging.Logger('rumps.watchdog', logging.INFO)  # per instance, not in the logging registry
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=512 * 1024, backupCount=3)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        self._logger.addHandler(handler)
+
+        self._nstimer = NSTimer.timerWithTimeInterval_target_selector_userInfo_repeats_(
+            self._interval, self, 'beat:', None, True)
+
+    def __repr__(self):
+        return '<{}: [threshold: {}; last beat: {}]>'.format(type(self).__name__, self._threshold, self._last_beat)
+
+    def beat_(self, _):
+        self._last_beat = time.time()
+
+    def start(self):
+        NSRunLoop.currentRunLoop().addTimer_forMode_(self._nstimer, NSRunLoopCommonModes)
+        super(_Watchdog, self).start()
+
+    def run(self):
+        stalled_since = None
+        while True:
+            time.sleep(self._interval)
+            last_beat = self._last_beat
+            if time.time() - last_beat > self._threshold:
+                if stalled_since != last_beat:
+                    stalled_since = last_beat
+                    self._report_stall(time.time() - last_beat)
+            elif stalled_since is not None:
+                self._logger.info('main thread responsive again after {:.2f}s'.format(last_beat - stalled_since))
+                stalled_since = None
+
+    def _report_stall(self, duration):
+        running = _running_callback
+        if running is None:
+            callback = 'none'
+        else:
+            f, event = running
+            callback = '{}.{} (sender: {})'.format(getattr(f, '__module__', '?'), getattr(f, '__name__', repr(f)),
+                                                  type(event).__name__)
+        frame = sys._current_frames().get(self._main_thread_id)
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else 'unavailable\n'
+        self._logger.warning('main thread stalled for {:.2f}s; callback: {}\n{}'.format(duration, callback, stack))
+        _log('main thread stalled for {:.2f}s; callback: {}'.format(duration, callback))
+
+
 class Window(object):
     """
     Window class for consuming user input.
@@ -418,11 +891,9 @@ class NSApp(NSObject):
     def userNotificationCenter_didActivateNotification_(self, notification_center, notification):
         notification_center.removeDeliveredNotification_(notification)
         data = dict(notification.userInfo())
-        try:
-            _call_as_function_or_method(getattr(notifications, '*notification_center'), data)
-        except AttributeError:  # notification center function not specified -> no error but warning in log
-            _log('WARNING: notification received but no function specified for answering it; use @notifications '
-                 'decorator to register a function.')
+        if _recorder is not None:
+            _recorder.notification(data)
+        _dispatch_notification(data)
 
     def initializeStatusBar(self):
         _log(self)
@@ -466,7 +937,6 @@ class App(object):
         self.icon = icon
         self.title = title
         self.menu = menu
-        self._application_support = application_support(self._name)
 
     # Properties
     #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -475,6 +945,10 @@ class App(object):
     def name(self):
         return self._name
 
+    @property
+    def _application_support(self):
+        return application_support(self._name)  # only created once needed, so App.replay can do without it
+
     @property
     def title(self):
         return self._title
@@ -541,6 +1015,52 @@ class App(object):
     def open(self, *args):
         return open(os.path.join(self._application_support, args[0]), *args[1:])
 
+    # Inspect memory use
+    #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+    def memory_report(self, previous=None):
+        """
+        Count what the app is holding on to: menu items, registered click callbacks, images (menu item icons and the
+        status bar icon), @timer timers and pending @clicked registrations. Each category maps to a dict with 'count'.
+        Images also have 'size', the decoded bitmaps estimated at 4 bytes per pixel; the other categories are mostly
+        references to objects shared with the rest of the program, so there is no size of their own worth reporting --
+        use trace_memory to see what callbacks allocate. If it is on, 'growth' maps each callback to the net bytes it
+        has allocated. Pass a report returned earlier as `previous` to also get the change since then under 'delta'.
+        """
+        menuitems = [] if self._menu is None else list(_walk_menu(self._menu))
+        registered = MenuItem._ns_to_py_and_callback
+        images = [m._icon for m in menuitems + [m for m, _ in registered.itervalues()] if m._icon is not None]
+        try:
+            images.append(self._nsapp.nsstatusitem.image())
+        except AttributeError:  # not running or no status bar icon set
+            pass
+        images = dict((id(i), i) for i in images if i is not None)
+
+        report = {
+            'menuitems': {'count': len(menuitems)},
+            'callbacks': {'count': len(registered)},
+            'images': {'count': len(images),
+                       'size': sum(rep.pixelsWide() * rep.pixelsHigh() * 4
+                                   for i in images.itervalues() for rep in i.representations())},
+            'timers': {'count': len(getattr(timer, '*timers', []))},
+            'buttons': {'count': len(getattr(clicked, '*buttons', []))},
+        }
+        if _memory_growth is not None:
+            report['growth'] = dict(_memory_growth)
+
+        if previous is not None:
+            delta = {}
+            for category, current in report.iteritems():
+                before = previous.get(category, {})
+                if category == 'growth':
+                    delta[category] = dict((label, size - before.get(label, 0)) for label, size in current.iteritems()
+                                           if size != before.get(label, 0))
+                else:
+                    delta[category] = dict((k, current[k] - before.get(k, 0)) for k in current)
+            report['delta'] = delta
+        _log(report)
+        return report
+
     # Run the application
     #- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
@@ -548,6 +1068,7 @@ class App(object):
         """
         Perform various setup tasks then start application run loop.
         """
+        global _recorder
         nsapplication = NSApplication.sharedApplication()
         nsapplication.activateIgnoringOtherApps_(True)  # NSAlerts in front
         self._nsapp = NSApp.alloc().init()
@@ -557,10 +1078,70 @@ class App(object):
         NSUserNotificationCenter.defaultUserNotificationCenter().setDelegate_(self._nsapp)
 
         setattr(App, '*app_instance', self)  # class level ref to running instance (for passing self to App subclasses)
+        try:
+            filename = getattr(record_events, '*filename')
+        except AttributeError:  # recording not enabled
+            pass
+        else:  # before starting timers, which fire right away
+            _recorder = _EventRecorder(os.path.join(self._application_support, filename), self)
         for t in getattr(timer, '*timers', []):
             t.start()
         for b in getattr(clicked, '*buttons', []):
             b(self)  # we waited on registering clicks so we could pass self to access _menu attribute
+        try:
+            threshold, filename = getattr(watchdog, '*settings')
+        except AttributeError:  # watchdog not enabled
+            pass
+        else:
+            _Watchdog(os.path.join(self._application_support, filename), threshold).start()
 
         AppHelper.runEventLoop()
         sys.exit(0)
+
+    def replay(self, filename, realtime=False):
+        """
+        Feed events written by record_events back through the callbacks of this app, in order, without starting the
+        application run loop. With `realtime` the original spacing between events is kept; otherwise they are sent as
+        fast as possible. Returns the number of events replayed.
+
+        Nothing here needs PyObjC or the application support folder. With the environment variable RUMPS_BACKEND=stub
+        set before importing rumps, a stub backend stands in for PyObjC, so a trace recorded on a Mac can be replayed
+        and profiled anywhere. Entries clicked in bound submenus are shown again with their recorded titles.
+        """
+        global _recorder
+        setattr(App, '*app_instance', self)
+        for b in getattr(clicked, '*buttons', []):
+            b(self)
+        timers = getattr(timer, '*timers', [])
+
+        recorder, _recorder = _recorder, None  # replayed events aren't new events
+        start = time.time()
+        count = 0
+        try:
+            with open(filename) as f:
+                for line in f:
+                    offset, kind, target = json.loads(line)
+                    if realtime:
+                        delay = start + offset - time.time()
+                        if delay > 0:
+                            time.sleep(delay)
+                    if kind in ('click', 'feed'):
+                        path, slot, title = (target, None, None) if kind == 'click' else target
+                        menuitem = self._menu
+                        for key in path:
+                            menuitem = menuitem[_utf8(key)]  # keys are str, as with MenuItem titles
+                        if slot is not None:
+                            menuitem = menuitem._window.item(slot)
+                        if title is not None:
+                            menuitem.title = _utf8(title)  # whatever the feed shows now, click what was clicked then
+                        MenuItem.callback_(menuitem())
+                    elif kind == 'timer':
+                        timers[target].callback_(None)
+                    elif kind == 'notification':
+                        _dispatch_notification(target)
+                    else:
+                        raise ValueError('unknown event kind {} in {}'.format(repr(kind), filename))
+                    count += 1
+        finally:
+            _recorder = recorder
+        return count
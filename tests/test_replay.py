@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Record events from an app running on the stub backend and replay them into a fresh instance of the same app.
+
+    RUMPS_BACKEND=stub python -m unittest discover tests
+"""
+import os
+os.environ['RUMPS_BACKEND'] = 'stub'
+
+import json
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import rumps
+from rumps import rumps as _rumps
+
+calls = []
+
+
+class FeedApp(rumps.App):
+    def __init__(self, feed):
+        super(FeedApp, self).__init__('FeedApp', menu=['One', 'Caf\xc3\xa9', ('Sub', ['Two']), 'Builds'])
+        self.menu['Builds'].bind(visible=2, history=10, callback=self.build)
+        for entry in feed:
+            self.menu['Builds'].push(entry)
+
+    def build(self, sender):
+        calls.append(('build', sender.title))
+
+    @rumps.clicked('One')
+    def one(self, sender):
+        calls.append(('click', sender.title))
+
+    @rumps.clicked('Caf\xc3\xa9')
+    def cafe(self, sender):
+        calls.append(('click', sender.title))
+
+    @rumps.clicked('Sub', 'Two')
+    def two(self, sender):
+        calls.append(('click', sender.title))
+
+
+@rumps.timer(60)
+def tick(sender):
+    calls.append(('tick',))
+
+
+@rumps.notifications
+def notified(data):
+    calls.append(('notification', data))
+
+
+def activate(app, data):
+    notification = _rumps.NSUserNotification.alloc().init()
+    notification.setUserInfo_(data)
+    app._nsapp.userNotificationCenter_didActivateNotification_(
+        _rumps.NSUserNotificationCenter.defaultUserNotificationCenter(), notification)
+
+
+def click(menuitem):
+    _rumps.MenuItem.callback_(menuitem())
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    def setUp(self):
+        self.home = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.home, 'Library', 'Application Support'))
+        self.old_home, os.environ['HOME'] = os.environ.get('HOME'), self.home
+        del calls[:]
+
+    def tearDown(self):
+        _rumps._recorder = None
+        rumps.record_events.__dict__.pop('*filename', None)
+        if self.old_home is not None:
+            os.environ['HOME'] = self.old_home
+        shutil.rmtree(self.home)
+
+    def record(self):
+        rumps.record_events('events.log')
+        app = FeedApp(['build 1', 'build 2', 'build 3'])
+        with self.assertRaises(RuntimeError):  # the stub has no event loop to run
+            app.run()
+        return app, os.path.join(app._application_support, 'events.log')
+
+    def test_round_trip(self):
+        app, path = self.record()
+        window = app.menu['Builds']._window
+        click(app.menu['One'])
+        click(app.menu['Caf\xc3\xa9'])
+        click(app.menu['Sub']['Two'])
+        click(window.item(1))
+        click(window.item('more'))
+        click(window.item(1))
+        click(window.item('top'))
+        activate(app, {'build': 3, 'tags': ['a', 'b'], 'meta': {'ok': True}})
+        recorded = list(calls)
+
+        del calls[:]
+        replayed_app = FeedApp(['something else entirely'])
+        self.assertEqual(replayed_app.replay(path), 9)
+        self.assertEqual(calls, recorded)
+        self.assertEqual(recorded[:5], [('tick',), ('click', 'One'), ('click', 'Caf\xc3\xa9'), ('click', 'Two'),
+                                        ('build', 'build 2')])
+        self.assertEqual(recorded[5], ('build', 'build 1'))
+
+    def test_unserializable_notification_is_not_recorded(self):
+        app, path = self.record()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            activate(app, {'when': object()})
+        self.assertEqual([w.category for w in caught], [RuntimeWarning])
+        self.assertEqual(calls[-1][0], 'notification')
+        with open(path) as f:
+            self.assertEqual([json.loads(line)[1] for line in f], ['timer'])
+
+
+if __name__ == '__main__':
+    unittest.main()